@@ -1,23 +1,54 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
 import re
+import stat
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from fastapi import FastAPI, HTTPException
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 
+try:  # Optional: SIMD multi-literal matching for the schema keyword check
+    import hyperscan  # type: ignore
+except ImportError:  # pragma: no cover
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI(title="PaperSnap OCR Worker", version="0.2.0")
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, which is much faster on large OCR meta."""
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. ints beyond 64 bits, which the stdlib encoder still handles
+            return super().render(content)
+
+
+app = FastAPI(
+    title="PaperSnap OCR Worker",
+    version="0.2.0",
+    default_response_class=ORJSONResponse,
+)
 
 
 # -------------------------------------------------------------------
@@ -44,6 +75,9 @@ class EngineState:
 class AnalyzeRequest(BaseModel):
     file_path: str = Field(..., alias="file_path")
     document_id: Optional[str] = Field(default=None, alias="documentId")
+    # Include every engine's raw response (model output, GCV protobuf, DeepSeek
+    # JSON) in ocrMeta.engineDetails; off by default as these can be very large
+    raw_meta: bool = Field(default=False, alias="rawMeta")
 
 
 class EngineToggleRequest(BaseModel):
@@ -98,6 +132,20 @@ def _serialize_engine_state(state: EngineState) -> Dict[str, Any]:
     }
 
 
+def _build_http_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared keep-alive pool for DeepSeek calls (health probes and OCR uploads)
+_http_session = _build_http_session()
+
+
+# Installed packages don't change while the worker runs; toggles clear this
+@functools.lru_cache(maxsize=32)
 def _load_module(module_name: str) -> Tuple[bool, Optional[str]]:
     try:
         __import__(module_name)
@@ -137,7 +185,7 @@ def _detect_deepseek() -> Tuple[bool, Optional[str]]:
         return False, "DEEPSEEK_OCR_URL not configured"
     try:
         health_url = url.rstrip("/") + "/health"
-        response = requests.get(health_url, timeout=3)
+        response = _http_session.get(health_url, timeout=1)
         if response.status_code >= 400:
             return False, f"Health check failed ({response.status_code})"
     except requests.RequestException as exc:
@@ -157,34 +205,100 @@ ENGINE_DETECTORS = {
 # Order in which we try engines when fusing
 ENGINE_ORDER = ["chandra", "surya", "gcv", "deepseek"]
 
+# Upper bound on engines running at the same time (models can be heavy)
+MAX_CONCURRENCY = max(1, int(os.getenv("OCR_MAX_CONCURRENCY", "4")))
+
+# Stop waiting on slower engines once the text collected so far is longer than
+# this and looks like a surgery note; 0 (default) always waits for every engine
+EARLY_EXIT_MIN_CHARS = int(os.getenv("OCR_EARLY_EXIT_MIN_CHARS", "0"))
+
+# Seconds an availability probe stays valid before engines are re-detected
+ENGINE_HEALTH_TTL_SECONDS = int(os.getenv("ENGINE_HEALTH_TTL", "30"))
+# Upper bound on a single detector so one hung probe cannot stall a refresh
+ENGINE_DETECT_TIMEOUT_SECONDS = float(os.getenv("ENGINE_DETECT_TIMEOUT", "5"))
+
 engine_states: EngineStates = _initial_engine_states()
 
+_engine_state_cache_ts: float = 0.0
+_engine_refresh_lock = asyncio.Lock()
+_engine_refresh_task: Optional[asyncio.Task] = None
+
+
+def _engine_states_stale() -> bool:
+    return time.monotonic() - _engine_state_cache_ts >= ENGINE_HEALTH_TTL_SECONDS
 
-def refresh_engine_states() -> None:
-    for engine_id, state in engine_states.items():
-        detector = ENGINE_DETECTORS.get(engine_id)
-        if not detector:
-            continue
-        available, reason = detector()
+
+async def _run_detector(engine_id: str) -> Tuple[bool, Optional[str]]:
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, ENGINE_DETECTORS[engine_id]),
+            timeout=ENGINE_DETECT_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Availability check for %s timed out", engine_id)
+        return False, "Availability check timed out"
+    except Exception as exc:  # pragma: no cover
+        logger.exception("Availability check for %s failed: %s", engine_id, exc)
+        return False, f"Availability check failed: {exc}"
+
+
+async def _refresh_engine_states_async() -> None:
+    global _engine_state_cache_ts
+
+    # Detectors touch independent resources, so run them side by side
+    engine_ids = [engine_id for engine_id in engine_states if engine_id in ENGINE_DETECTORS]
+    outcomes = await asyncio.gather(*(_run_detector(engine_id) for engine_id in engine_ids))
+
+    for engine_id, (available, reason) in zip(engine_ids, outcomes):
+        state = engine_states[engine_id]
         state.available = available
         state.reason = reason
 
+    rebuild_engine_dispatch()
+    _engine_state_cache_ts = time.monotonic()
+
+
+async def refresh_engine_states(force: bool = False) -> None:
+    if not force and not _engine_states_stale():
+        return
+
+    async with _engine_refresh_lock:
+        # Another request may have refreshed while we waited for the lock
+        if not force and not _engine_states_stale():
+            return
+        await _refresh_engine_states_async()
+
+
+async def _engine_health_loop() -> None:
+    while True:
+        await asyncio.sleep(ENGINE_HEALTH_TTL_SECONDS)
+        try:
+            await refresh_engine_states(force=True)
+        except Exception as exc:  # pragma: no cover
+            logger.exception("Background engine refresh failed: %s", exc)
+
 
 # -------------------------------------------------------------------
 # Common utilities
 # -------------------------------------------------------------------
 
 
+_JSON_ATOMIC = (str, int, float, bool, type(None))
+
+
 def ensure_jsonable(value: Any) -> Any:
-    try:
-        json.dumps(value)
+    # Type-directed walk: one linear pass instead of json.dumps probes per level
+    if isinstance(value, _JSON_ATOMIC):
         return value
-    except TypeError:
-        if isinstance(value, dict):
-            return {k: ensure_jsonable(v) for k, v in value.items()}
-        if isinstance(value, (list, tuple, set)):
-            return [ensure_jsonable(v) for v in value]
-        return str(value)
+    if isinstance(value, dict):
+        return {
+            (k if isinstance(k, _JSON_ATOMIC) else str(k)): ensure_jsonable(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple, set)):
+        return [ensure_jsonable(v) for v in value]
+    return str(value)
 
 
 def extract_text_from_output(output: Any) -> str:
@@ -226,29 +340,136 @@ def extract_text_from_output(output: Any) -> str:
     return str(output)
 
 
+def read_regular_file(file_path: Path) -> Optional[bytes]:
+    """Read a regular file's bytes, or return None if it is missing or not a file."""
+    try:
+        # O_NONBLOCK keeps a FIFO from blocking the open; it is a no-op for files
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0))
+    except OSError:
+        return None
+
+    try:
+        # fstat on the open descriptor: one check, no race with the read
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+        with os.fdopen(fd, "rb", closefd=False) as file_handle:
+            return file_handle.read()
+    finally:
+        os.close(fd)
+
+
+# Percent-encode quote, CR and LF in filenames, as browsers do, so a name
+# cannot terminate the header value or inject extra part headers
+_MULTIPART_FILENAME_ESCAPES = str.maketrans({'"': "%22", "\r": "%0D", "\n": "%0A"})
+
+
+class _MultipartUpload:
+    """Single-file multipart/form-data body streamed from an in-memory buffer."""
+
+    chunk_size = 1024 * 1024
+
+    def __init__(
+        self,
+        field_name: str,
+        filename: str,
+        content: bytes,
+        mime_type: str = "application/octet-stream",
+    ) -> None:
+        self.boundary = uuid.uuid4().hex
+        self._content = memoryview(content)
+        filename = filename.translate(_MULTIPART_FILENAME_ESCAPES)
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+            f"Content-Type: {mime_type}\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        # Lets requests send a Content-Length instead of chunked encoding
+        return len(self._head) + len(self._content) + len(self._tail)
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        yield self._head
+        # memoryview slices hand the shared buffer to the socket without copying it
+        for offset in range(0, len(self._content), self.chunk_size):
+            yield self._content[offset : offset + self.chunk_size]
+        yield self._tail
+
+
 # -------------------------------------------------------------------
 # Engine runners (Python APIs preferred; no broken CLI usage)
 # -------------------------------------------------------------------
 
 
-def run_chandra(file_path: Path) -> Optional[Dict[str, Any]]:
+def _build_chandra_predictor() -> Any:
+    from chandra_ocr import pipeline as chandra_pipeline  # type: ignore
+
+    predictor = None
+    if hasattr(chandra_pipeline, "Pipeline"):
+        predictor = chandra_pipeline.Pipeline()  # type: ignore[attr-defined]
+    elif hasattr(chandra_pipeline, "load_pipeline"):
+        predictor = chandra_pipeline.load_pipeline()
+    if predictor is None and hasattr(chandra_pipeline, "ChandraOCR"):
+        predictor = chandra_pipeline.ChandraOCR()  # type: ignore[attr-defined]
+
+    if predictor is None:
+        raise RuntimeError("Unsupported chandra_ocr API")
+    return predictor
+
+
+def _build_surya_predictor() -> Any:
+    from surya_ocr import pipeline as surya_pipeline  # type: ignore
+
+    predictor = None
+    if hasattr(surya_pipeline, "Pipeline"):
+        predictor = surya_pipeline.Pipeline()  # type: ignore[attr-defined]
+    elif hasattr(surya_pipeline, "load_pipeline"):
+        predictor = surya_pipeline.load_pipeline()
+    if predictor is None and hasattr(surya_pipeline, "SuryaOCR"):
+        predictor = surya_pipeline.SuryaOCR()  # type: ignore[attr-defined]
+
+    if predictor is None:
+        raise RuntimeError("Unsupported surya_ocr API")
+    return predictor
+
+
+PREDICTOR_BUILDERS = {
+    "chandra": _build_chandra_predictor,
+    "surya": _build_surya_predictor,
+}
+
+# Loaded pipelines stay resident so model weights load once per process. A
+# shared pipeline is not assumed thread-safe; collect_engine_results runs one
+# call per engine at a time (see _engine_call_locks).
+_predictors: Dict[str, Any] = {}
+_predictor_load_locks = {engine_id: threading.Lock() for engine_id in PREDICTOR_BUILDERS}
+
+
+def _get_predictor(engine_id: str) -> Any:
+    predictor = _predictors.get(engine_id)
+    if predictor is None:
+        with _predictor_load_locks[engine_id]:
+            predictor = _predictors.get(engine_id)
+            if predictor is None:
+                predictor = PREDICTOR_BUILDERS[engine_id]()
+                _predictors[engine_id] = predictor
+    return predictor
+
+
+def run_chandra(
+    file_path: Path, content: bytes, raw_meta: bool = False
+) -> Optional[Dict[str, Any]]:
     state = engine_states.get("chandra")
     if not (state and state.enabled and state.available):
         return None
 
     try:
-        from chandra_ocr import pipeline as chandra_pipeline  # type: ignore
-
-        predictor = None
-        if hasattr(chandra_pipeline, "Pipeline"):
-            predictor = chandra_pipeline.Pipeline()  # type: ignore[attr-defined]
-        elif hasattr(chandra_pipeline, "load_pipeline"):
-            predictor = chandra_pipeline.load_pipeline()
-        if predictor is None and hasattr(chandra_pipeline, "ChandraOCR"):
-            predictor = chandra_pipeline.ChandraOCR()  # type: ignore[attr-defined]
-
-        if predictor is None:
-            raise RuntimeError("Unsupported chandra_ocr API")
+        predictor = _get_predictor("chandra")
 
         if hasattr(predictor, "ocr"):
             output = predictor.ocr(str(file_path))  # type: ignore[misc]
@@ -261,32 +482,23 @@ def run_chandra(file_path: Path) -> Optional[Dict[str, Any]]:
         if not text.strip():
             return None
 
-        meta = ensure_jsonable(output)
-        return {"engine_id": "chandra", "text": text, "meta": {"raw": meta}}
+        meta = {"raw": output} if raw_meta else {}
+        return {"engine_id": "chandra", "text": text, "meta": meta}
 
     except Exception as exc:  # pragma: no cover
         logger.exception("Chandra OCR failed: %s", exc)
         return None
 
 
-def run_surya(file_path: Path) -> Optional[Dict[str, Any]]:
+def run_surya(
+    file_path: Path, content: bytes, raw_meta: bool = False
+) -> Optional[Dict[str, Any]]:
     state = engine_states.get("surya")
     if not (state and state.enabled and state.available):
         return None
 
     try:
-        from surya_ocr import pipeline as surya_pipeline  # type: ignore
-
-        predictor = None
-        if hasattr(surya_pipeline, "Pipeline"):
-            predictor = surya_pipeline.Pipeline()  # type: ignore[attr-defined]
-        elif hasattr(surya_pipeline, "load_pipeline"):
-            predictor = surya_pipeline.load_pipeline()
-        if predictor is None and hasattr(surya_pipeline, "SuryaOCR"):
-            predictor = surya_pipeline.SuryaOCR()  # type: ignore[attr-defined]
-
-        if predictor is None:
-            raise RuntimeError("Unsupported surya_ocr API")
+        predictor = _get_predictor("surya")
 
         if hasattr(predictor, "ocr"):
             output = predictor.ocr(str(file_path))  # type: ignore[misc]
@@ -299,8 +511,8 @@ def run_surya(file_path: Path) -> Optional[Dict[str, Any]]:
         if not text.strip():
             return None
 
-        meta = ensure_jsonable(output)
-        return {"engine_id": "surya", "text": text, "meta": {"raw": meta}}
+        meta = {"raw": output} if raw_meta else {}
+        return {"engine_id": "surya", "text": text, "meta": meta}
 
     except Exception as exc:  # pragma: no cover
         logger.exception("Surya OCR failed: %s", exc)
@@ -308,10 +520,24 @@ def run_surya(file_path: Path) -> Optional[Dict[str, Any]]:
 
 
 gcv_client = None
+_gcv_client_lock = threading.Lock()
 
 
-def run_gcv(file_path: Path) -> Optional[Dict[str, Any]]:
+def _get_gcv_client() -> Any:
     global gcv_client
+    if gcv_client is None:
+        with _gcv_client_lock:
+            # Engines run in executor threads; build the client only once
+            if gcv_client is None:
+                from google.cloud import vision  # type: ignore
+
+                gcv_client = vision.ImageAnnotatorClient()
+    return gcv_client
+
+
+def run_gcv(
+    file_path: Path, content: bytes, raw_meta: bool = False
+) -> Optional[Dict[str, Any]]:
     state = engine_states.get("gcv")
     if not (state and state.enabled and state.available):
         return None
@@ -320,14 +546,8 @@ def run_gcv(file_path: Path) -> Optional[Dict[str, Any]]:
         from google.cloud import vision  # type: ignore
         from google.protobuf.json_format import MessageToDict  # type: ignore
 
-        if gcv_client is None:
-            gcv_client = vision.ImageAnnotatorClient()
-
-        with file_path.open("rb") as f:
-            content = f.read()
-
         image = vision.Image(content=content)
-        response = gcv_client.document_text_detection(image=image)
+        response = _get_gcv_client().document_text_detection(image=image)
 
         if response.error.message:
             raise RuntimeError(response.error.message)
@@ -336,9 +556,6 @@ def run_gcv(file_path: Path) -> Optional[Dict[str, Any]]:
         if not full_text.strip():
             return None
 
-        response_meta = MessageToDict(
-            response._pb, preserving_proto_field_name=True  # type: ignore[attr-defined]
-        )
         locale: Optional[str] = None
         try:
             if (
@@ -355,18 +572,106 @@ def run_gcv(file_path: Path) -> Optional[Dict[str, Any]]:
         except Exception:  # pragma: no cover
             locale = None
 
-        meta = {
+        meta: Dict[str, Any] = {
             "locale": locale,
-            "raw": response_meta,
+            "pages": len(response.full_text_annotation.pages),
         }
-        return {"engine_id": "gcv", "text": full_text, "meta": ensure_jsonable(meta)}
+        if raw_meta:
+            # Converting the whole protobuf is costly on dense pages; only on request
+            meta["raw"] = MessageToDict(
+                response._pb, preserving_proto_field_name=True  # type: ignore[attr-defined]
+            )
+        return {"engine_id": "gcv", "text": full_text, "meta": meta}
 
     except Exception as exc:  # pragma: no cover
         logger.exception("Google Cloud Vision OCR failed: %s", exc)
         return None
 
 
-def run_deepseek(file_path: Path) -> Optional[Dict[str, Any]]:
+# Transient DeepSeek failures (e.g. an overloaded vLLM backend) are retried
+DEEPSEEK_MAX_ATTEMPTS = max(1, int(os.getenv("DEEPSEEK_MAX_ATTEMPTS", "3")))
+DEEPSEEK_BACKOFF_SECONDS = 0.5
+DEEPSEEK_BACKOFF_MAX_SECONDS = 4.0
+# Requests per second sent to DeepSeek; 0 disables the limit
+DEEPSEEK_MAX_RPS = float(os.getenv("DEEPSEEK_MAX_RPS", "0"))
+
+_DEEPSEEK_RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class _RateLimiter:
+    """Spaces calls at least 1 / rate seconds apart across threads."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+_deepseek_limiter = _RateLimiter(DEEPSEEK_MAX_RPS)
+
+
+def _deepseek_should_retry(response: requests.Response) -> bool:
+    if response.status_code in _DEEPSEEK_RETRY_STATUSES:
+        return True
+    if response.status_code >= 400:
+        body = response.text[:2048].lower()
+        return "rate limit" in body or "quota" in body
+    return False
+
+
+def _deepseek_retry_delay(attempt: int, response: Optional[requests.Response]) -> float:
+    delay = DEEPSEEK_BACKOFF_SECONDS * (2 ** (attempt - 1))
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = float(retry_after)
+    return min(delay, DEEPSEEK_BACKOFF_MAX_SECONDS)
+
+
+def _post_deepseek(url: str, filename: str, content: bytes) -> requests.Response:
+    attempt = 1
+    while True:
+        _deepseek_limiter.acquire()
+        # Each attempt gets a fresh body with its own boundary
+        upload = _MultipartUpload("file", filename, content)
+        response: Optional[requests.Response] = None
+        try:
+            response = _http_session.post(
+                url,
+                data=upload,
+                headers={"Content-Type": upload.content_type},
+                timeout=60,
+            )
+        except (requests.Timeout, requests.ConnectionError) as exc:
+            if attempt >= DEEPSEEK_MAX_ATTEMPTS:
+                raise
+            logger.warning("DeepSeek request failed (attempt %d): %s", attempt, exc)
+        else:
+            if attempt >= DEEPSEEK_MAX_ATTEMPTS or not _deepseek_should_retry(response):
+                return response
+            logger.warning(
+                "DeepSeek returned %s (attempt %d), retrying",
+                response.status_code,
+                attempt,
+            )
+
+        time.sleep(_deepseek_retry_delay(attempt, response))
+        attempt += 1
+
+
+def run_deepseek(
+    file_path: Path, content: bytes, raw_meta: bool = False
+) -> Optional[Dict[str, Any]]:
     state = engine_states.get("deepseek")
     if not (state and state.enabled and state.available):
         return None
@@ -376,23 +681,28 @@ def run_deepseek(file_path: Path) -> Optional[Dict[str, Any]]:
         return None
 
     try:
-        with file_path.open("rb") as file_handle:
-            files = {"file": (file_path.name, file_handle, "application/octet-stream")}
-            response = requests.post(url.rstrip("/"), files=files, timeout=60)
-
+        response = _post_deepseek(url.rstrip("/"), file_path.name, content)
         response.raise_for_status()
         data = response.json()
         text = data.get("text") or data.get("rawText") or ""
         if not text.strip():
             return None
 
-        return {"engine_id": "deepseek", "text": text, "meta": ensure_jsonable(data)}
+        meta = data if raw_meta else {}
+        return {"engine_id": "deepseek", "text": text, "meta": meta}
 
     except Exception as exc:  # pragma: no cover
         logger.exception("DeepSeek OCR failed: %s", exc)
         return None
 
 
+# Startup hooks that load an engine's client / model ahead of the first request
+ENGINE_WARMERS = {
+    "chandra": lambda: _get_predictor("chandra"),
+    "surya": lambda: _get_predictor("surya"),
+    "gcv": _get_gcv_client,
+}
+
 ENGINE_RUNNERS = {
     "chandra": run_chandra,
     "surya": run_surya,
@@ -400,6 +710,28 @@ ENGINE_RUNNERS = {
     "deepseek": run_deepseek,
 }
 
+EngineDispatch = Tuple[Tuple[str, Callable[..., Optional[Dict[str, Any]]]], ...]
+
+
+def _build_engine_dispatch() -> EngineDispatch:
+    dispatch = []
+    for engine_id in ENGINE_ORDER:
+        runner = ENGINE_RUNNERS.get(engine_id)
+        state = engine_states.get(engine_id)
+        if runner and state and state.enabled and state.available:
+            dispatch.append((engine_id, runner))
+    return tuple(dispatch)
+
+
+# Enabled and available runners in ENGINE_ORDER. Rebuilt whenever engine state
+# changes (refresh, toggle) so requests run it without re-checking each state.
+_engine_dispatch: EngineDispatch = _build_engine_dispatch()
+
+
+def rebuild_engine_dispatch() -> None:
+    global _engine_dispatch
+    _engine_dispatch = _build_engine_dispatch()
+
 
 # -------------------------------------------------------------------
 # Heuristic parsing & schema selection
@@ -414,26 +746,95 @@ SURGERY_KEYWORDS = [
     "ot note",
 ]
 
+# One alternation so the keyword check walks the text once instead of per keyword
+_SURGERY_RE = re.compile("|".join(re.escape(keyword) for keyword in SURGERY_KEYWORDS))
+
+
+def _compile_surgery_keyword_db() -> Any:
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[keyword.encode("utf-8") for keyword in SURGERY_KEYWORDS],
+            ids=list(range(len(SURGERY_KEYWORDS))),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(SURGERY_KEYWORDS),
+        )
+        return db
+    except hyperscan.error as exc:  # pragma: no cover
+        logger.warning("hyperscan unavailable, using re for keyword scan: %s", exc)
+        return None
+
+
+_SURGERY_DB = _compile_surgery_keyword_db()
+# The database owns a single scratch space, so scans must not overlap
+_surgery_db_lock = threading.Lock()
+
+
+def _has_surgery_keyword(lower_text: str) -> bool:
+    if _SURGERY_DB is None:
+        return _SURGERY_RE.search(lower_text) is not None
+
+    found: List[int] = []
+
+    def on_match(match_id: int, start: int, end: int, flags: int, context: Any) -> bool:
+        found.append(match_id)
+        return True  # any keyword is enough; stop scanning
+
+    with _surgery_db_lock:
+        try:
+            _SURGERY_DB.scan(
+                lower_text.encode("utf-8", "surrogatepass"),
+                match_event_handler=on_match,
+            )
+        except hyperscan.ScanTerminated:
+            pass
+    return bool(found)
+
+
+# Field patterns are compiled once at import rather than on every parse. They
+# run against lowered text: case-insensitive matching costs ~4x per scan.
+_RE_DATE = re.compile(
+    r"(?:surgery date|date of surgery|dos|operation date)[:\-\s]*"
+    r"([0-9]{4}[\-/][0-9]{2}[\-/][0-9]{2}|[0-9]{2}[\-/][0-9]{2}[\-/][0-9]{4})"
+)
+_RE_AGE = re.compile(r"(?:age|patient age)\D*([0-9]{1,3})")
+_RE_SEX = re.compile(r"(?:sex|gender)\D*([mf]|male|female)")
+_RE_DIAG = re.compile(r"diagnosis[:\-\s]*([^\n]+)")
+_RE_PROC = re.compile(r"procedure[:\-\s]*([^\n]+)")
+_RE_SURGEON = re.compile(r"surgeon[:\-\s]*([^\n]+)")
+_RE_WS = re.compile(r"\s+")
+
 
 def normalize_whitespace(value: str) -> str:
-    return re.sub(r"\s+", " ", value).strip()
+    return _RE_WS.sub(" ", value).strip()
+
+
+# re.IGNORECASE also equates these with "i" / "s" (and "İ" would otherwise lower
+# to two code points); mapping them first keeps matches and offsets identical
+_IGNORECASE_EXTRAS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
 
+def _lower_for_matching(text: str) -> str:
+    if text.isascii():
+        return text.lower()
+    return text.translate(_IGNORECASE_EXTRAS).lower()
 
-def parse_surgery_fields(raw_text: str) -> Dict[str, Any]:
+
+def parse_surgery_fields(raw_text: str, lower_text: Optional[str] = None) -> Dict[str, Any]:
     fields: Dict[str, Any] = {}
-    lower_text = raw_text.lower()
+    if lower_text is None:
+        lower_text = _lower_for_matching(raw_text)
 
     def add_field(key: str, value: Optional[Any], confidence: float) -> None:
         if value is None:
             return
         fields[key] = {"value": value, "confidence": confidence}
 
-    date_match = re.search(
-        r"(?:surgery date|date of surgery|dos|operation date)[:\-\s]*"
-        r"([0-9]{4}[\-/][0-9]{2}[\-/][0-9]{2}|[0-9]{2}[\-/][0-9]{2}[\-/][0-9]{4})",
-        raw_text,
-        flags=re.IGNORECASE,
-    )
+    def original_group(match: re.Match) -> str:
+        return raw_text[match.start(1) : match.end(1)]
+
+    date_match = _RE_DATE.search(lower_text)
     if date_match:
         date_value = date_match.group(1).replace("/", "-")
         parts = date_value.split("-")
@@ -441,48 +842,28 @@ def parse_surgery_fields(raw_text: str) -> Dict[str, Any]:
             date_value = f"{parts[2]}-{parts[1]}-{parts[0]}"
         add_field("surgeryDate", date_value, 0.85)
 
-    age_match = re.search(
-        r"(?:age|patient age)\D*([0-9]{1,3})",
-        raw_text,
-        flags=re.IGNORECASE,
-    )
+    age_match = _RE_AGE.search(lower_text)
     if age_match:
         add_field("patientAge", int(age_match.group(1)), 0.8)
 
-    sex_match = re.search(
-        r"(?:sex|gender)\D*([MF]|male|female)",
-        raw_text,
-        flags=re.IGNORECASE,
-    )
+    sex_match = _RE_SEX.search(lower_text)
     if sex_match:
         value = sex_match.group(1).upper()
         if value in {"MALE", "FEMALE"}:
             value = value[0]
         add_field("patientSex", value, 0.75)
 
-    diagnosis_match = re.search(
-        r"diagnosis[:\-\s]*([^\n]+)",
-        raw_text,
-        flags=re.IGNORECASE,
-    )
+    diagnosis_match = _RE_DIAG.search(lower_text)
     if diagnosis_match:
-        add_field("diagnosis", normalize_whitespace(diagnosis_match.group(1)), 0.9)
+        add_field("diagnosis", normalize_whitespace(original_group(diagnosis_match)), 0.9)
 
-    procedure_match = re.search(
-        r"procedure[:\-\s]*([^\n]+)",
-        raw_text,
-        flags=re.IGNORECASE,
-    )
+    procedure_match = _RE_PROC.search(lower_text)
     if procedure_match:
-        add_field("procedure", normalize_whitespace(procedure_match.group(1)), 0.88)
+        add_field("procedure", normalize_whitespace(original_group(procedure_match)), 0.88)
 
-    surgeon_match = re.search(
-        r"surgeon[:\-\s]*([^\n]+)",
-        raw_text,
-        flags=re.IGNORECASE,
-    )
+    surgeon_match = _RE_SURGEON.search(lower_text)
     if surgeon_match:
-        add_field("surgeon", normalize_whitespace(surgeon_match.group(1)), 0.7)
+        add_field("surgeon", normalize_whitespace(original_group(surgeon_match)), 0.7)
 
     if "emergency" in lower_text:
         add_field("emergencyFlag", True, 0.9)
@@ -498,9 +879,10 @@ def build_generic_fields(raw_text: str) -> Dict[str, Any]:
 
 
 def infer_schema(raw_text: str) -> Tuple[str, Dict[str, Any]]:
-    lower_text = raw_text.lower()
-    if any(keyword in lower_text for keyword in SURGERY_KEYWORDS):
-        fields = parse_surgery_fields(raw_text)
+    # Lowered once and shared by the keyword check and the field patterns
+    lower_text = _lower_for_matching(raw_text)
+    if _has_surgery_keyword(lower_text):
+        fields = parse_surgery_fields(raw_text, lower_text)
         return "surgery_note_v1", fields
     return "generic_v1", build_generic_fields(raw_text)
 
@@ -521,6 +903,7 @@ def fuse_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
         if text:
             raw_sections.append(f"[{engine_id.upper()}]\n{text}")
 
+        # Runners hand back raw engine output; normalize it once here
         meta = result.get("meta")
         if meta is not None:
             engine_meta[engine_id] = ensure_jsonable(meta)
@@ -581,28 +964,176 @@ def stub_payload(document_id: Optional[str]) -> Dict[str, Any]:
 # -------------------------------------------------------------------
 
 
-def collect_engine_results(file_path: Path) -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
+# Serialized fused results keyed by file content, so identical uploads skip
+# the engines. Bounded by entry count and by total body size.
+RESULT_CACHE_SIZE = int(os.getenv("OCR_RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("OCR_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
 
-    for engine_id in ENGINE_ORDER:
-        runner = ENGINE_RUNNERS.get(engine_id)
-        state = engine_states.get(engine_id)
+_RESULT_CACHE: OrderedDict[str, bytes] = OrderedDict()
+_result_cache_bytes = 0
+_result_cache_lock = asyncio.Lock()
 
-        if runner is None or state is None:
-            continue
-        if not state.enabled or not state.available:
-            continue
 
-        try:
-            result = runner(file_path)
-        except Exception as exc:  # pragma: no cover
-            logger.exception("Engine %s raised unexpected exception: %s", engine_id, exc)
-            result = None
+def read_and_digest(file_path: Path) -> Optional[Tuple[bytes, str]]:
+    content = read_regular_file(file_path)
+    if content is None:
+        return None
+    return content, hashlib.blake2b(content, digest_size=16).hexdigest()
+
 
-        if result and result.get("text"):
-            results.append(result)
+def _result_cache_key(digest: str, raw_meta: bool) -> str:
+    # Engine toggles / availability change the output, so they are part of the key
+    engine_bitmap: List[str] = []
+    for engine_id in ENGINE_ORDER:
+        state = engine_states.get(engine_id)
+        engine_bitmap.append("1" if state and state.enabled and state.available else "0")
+    return f"{digest}:{''.join(engine_bitmap)}:{int(raw_meta)}"
+
+
+async def _result_cache_get(key: str) -> Optional[bytes]:
+    async with _result_cache_lock:
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(key)
+        return cached
+
+
+async def _result_cache_put(key: str, body: bytes) -> None:
+    global _result_cache_bytes
+    if RESULT_CACHE_SIZE <= 0 or len(body) > RESULT_CACHE_MAX_BYTES:
+        return
+    async with _result_cache_lock:
+        previous = _RESULT_CACHE.pop(key, None)
+        if previous is not None:
+            _result_cache_bytes -= len(previous)
+        _RESULT_CACHE[key] = body
+        _result_cache_bytes += len(body)
+        while (
+            len(_RESULT_CACHE) > RESULT_CACHE_SIZE
+            or _result_cache_bytes > RESULT_CACHE_MAX_BYTES
+        ):
+            _, evicted = _RESULT_CACHE.popitem(last=False)
+            _result_cache_bytes -= len(evicted)
+
+
+engine_semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+# Engines with a shared, resident pipeline take one call at a time. Requests
+# queue here before taking a global slot, so a backlog on one model does not
+# hold slots that other engines could use.
+_engine_call_locks = {engine_id: asyncio.Lock() for engine_id in PREDICTOR_BUILDERS}
+
+
+async def _run_engine(
+    engine_id: str, runner: Any, file_path: Path, content: bytes, raw_meta: bool
+) -> Optional[Dict[str, Any]]:
+    loop = asyncio.get_running_loop()
+    engine_lock = _engine_call_locks.get(engine_id)
+
+    def release_slots() -> None:
+        engine_semaphore.release()
+        if engine_lock is not None:
+            engine_lock.release()
+
+    def on_done(future: "asyncio.Future[Any]") -> None:
+        release_slots()
+        # Runs for abandoned calls too; consume the outcome so it is not logged
+        # as an unretrieved exception
+        if not future.cancelled():
+            future.exception()
+
+    if engine_lock is not None:
+        await engine_lock.acquire()
+    try:
+        await engine_semaphore.acquire()
+    except BaseException:
+        if engine_lock is not None:
+            engine_lock.release()
+        raise
+    try:
+        future = loop.run_in_executor(None, runner, file_path, content, raw_meta)
+    except BaseException:
+        release_slots()
+        raise
+    # Cancelling this coroutine (early exit) cannot stop the worker thread, so
+    # the slots are released only once the call itself finishes.
+    future.add_done_callback(on_done)
+    return await asyncio.shield(future)
+
+
+def _results_sufficient(results: Dict[str, Dict[str, Any]]) -> bool:
+    if EARLY_EXIT_MIN_CHARS <= 0 or not results:
+        return False
+    text = "\n".join(result["text"] for result in results.values())
+    return len(text) > EARLY_EXIT_MIN_CHARS and _has_surgery_keyword(_lower_for_matching(text))
+
+
+async def collect_engine_results(
+    file_path: Path, content: bytes, raw_meta: bool = False
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Run the enabled engines and return (results in ENGINE_ORDER, complete).
+
+    ``complete`` is True only when every dispatched engine produced text.
+    """
+    tasks: Dict[asyncio.Future, str] = {}
+
+    for engine_id, runner in _engine_dispatch:
+        task = asyncio.ensure_future(
+            _run_engine(engine_id, runner, file_path, content, raw_meta)
+        )
+        tasks[task] = engine_id
+
+    # Engines are independent, so run them side by side and take them as they finish
+    collected: Dict[str, Dict[str, Any]] = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                engine_id = tasks[task]
+                exc = task.exception()
+                if exc is not None:  # pragma: no cover
+                    logger.error(
+                        "Engine %s raised unexpected exception: %s",
+                        engine_id,
+                        exc,
+                        exc_info=exc,
+                    )
+                    continue
+
+                result = task.result()
+                if result and result.get("text"):
+                    collected[engine_id] = result
+
+            if pending and _results_sufficient(collected):
+                logger.info(
+                    "OCR text sufficient; not waiting for %s",
+                    ", ".join(sorted(tasks[task] for task in pending)),
+                )
+                break
+    finally:
+        # Engines already running in a worker thread finish in the background
+        # and their output is dropped; queued ones never start
+        for task in pending:
+            task.cancel()
+
+    results = [collected[engine_id] for engine_id in ENGINE_ORDER if engine_id in collected]
+    return results, len(collected) == len(tasks)
+
+
+async def warm_engines() -> None:
+    # Pay model loading / client setup here rather than on the first request
+    engine_ids: List[str] = []
+    tasks = []
+    for engine_id, warmer in ENGINE_WARMERS.items():
+        state = engine_states.get(engine_id)
+        if state and state.enabled and state.available:
+            engine_ids.append(engine_id)
+            tasks.append(run_in_threadpool(warmer))
 
-    return results
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    for engine_id, outcome in zip(engine_ids, outcomes):
+        if isinstance(outcome, BaseException):  # pragma: no cover
+            logger.warning("Warmup for engine %s failed: %s", engine_id, outcome)
 
 
 # -------------------------------------------------------------------
@@ -612,13 +1143,27 @@ def collect_engine_results(file_path: Path) -> List[Dict[str, Any]]:
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    refresh_engine_states()
+    global _engine_refresh_task
+    await refresh_engine_states(force=True)
+
+    if env_bool("OCR_WARMUP_ON_STARTUP", True):
+        await warm_engines()
+
+    if ENGINE_HEALTH_TTL_SECONDS > 0:
+        _engine_refresh_task = asyncio.create_task(_engine_health_loop())
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    if _engine_refresh_task is not None:
+        _engine_refresh_task.cancel()
+    _http_session.close()
 
 
 @app.get("/health")
-async def health() -> JSONResponse:
-    refresh_engine_states()
-    return JSONResponse(
+async def health() -> ORJSONResponse:
+    await refresh_engine_states()
+    return ORJSONResponse(
         {
             "status": "ok",
             "engines": [
@@ -630,9 +1175,9 @@ async def health() -> JSONResponse:
 
 
 @app.get("/engines")
-async def list_engines() -> JSONResponse:
-    refresh_engine_states()
-    return JSONResponse(
+async def list_engines() -> ORJSONResponse:
+    await refresh_engine_states()
+    return ORJSONResponse(
         {
             "engines": [
                 _serialize_engine_state(state)
@@ -643,7 +1188,7 @@ async def list_engines() -> JSONResponse:
 
 
 @app.post("/engines/{engine_id}")
-async def toggle_engine(engine_id: str, payload: EngineToggleRequest) -> JSONResponse:
+async def toggle_engine(engine_id: str, payload: EngineToggleRequest) -> ORJSONResponse:
     state = engine_states.get(engine_id)
     if not state:
         raise HTTPException(status_code=404, detail="Engine not found")
@@ -653,28 +1198,39 @@ async def toggle_engine(engine_id: str, payload: EngineToggleRequest) -> JSONRes
 
     state.enabled = payload.enabled
 
-    # Re-check availability when toggled
-    detector = ENGINE_DETECTORS.get(engine_id)
-    if detector:
-        available, reason = detector()
+    # Re-check availability when toggled, including a fresh import attempt
+    if engine_id in ENGINE_DETECTORS:
+        _load_module.cache_clear()
+        available, reason = await _run_detector(engine_id)
         state.available = available
         state.reason = reason
 
+    rebuild_engine_dispatch()
+
     return await list_engines()
 
 
 @app.post("/analyze")
-async def analyze(request: AnalyzeRequest) -> JSONResponse:
-    file_path = Path(request.file_path).expanduser().resolve()
-    if not file_path.exists() or not file_path.is_file():
+async def analyze(request: AnalyzeRequest) -> Response:
+    file_path = Path(request.file_path).expanduser().absolute()
+
+    # Validate, read and hash in one worker hop; every engine shares this buffer
+    upload = await run_in_threadpool(read_and_digest, file_path)
+    if upload is None:
         raise HTTPException(
             status_code=400,
             detail="file_path does not exist or is not a file",
         )
+    content, digest = upload
+
+    await refresh_engine_states()
 
-    refresh_engine_states()
+    cache_key = _result_cache_key(digest, request.raw_meta)
+    cached = await _result_cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
 
-    results = await run_in_threadpool(collect_engine_results, file_path)
+    results, complete = await collect_engine_results(file_path, content, request.raw_meta)
 
     if not results:
         stub_state = engine_states.get("stub")
@@ -683,12 +1239,15 @@ async def analyze(request: AnalyzeRequest) -> JSONResponse:
                 "Falling back to stub OCR for %s",
                 request.document_id or file_path.name,
             )
-            return JSONResponse(content=stub_payload(request.document_id))
+            return ORJSONResponse(content=stub_payload(request.document_id))
 
         raise HTTPException(status_code=500, detail="No OCR engines available")
 
-    fused = fuse_results(results)
-    return JSONResponse(content=fused)
+    response = ORJSONResponse(content=fuse_results(results))
+    # A missing engine may be a transient failure; only full results are reused
+    if complete:
+        await _result_cache_put(cache_key, response.body)
+    return response
 
 
 if __name__ == "__main__":